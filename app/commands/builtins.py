@@ -1,9 +1,9 @@
 import os
 import sys
-import shutil
 from pathlib import Path
 from ..types import Command, is_builtin
 from ..parsing import parse_segment, expand_path
+from .resolution import file_exists_in_path
 
 HISTFILE = os.path.expanduser('~/.pynix_history')
 
@@ -61,7 +61,9 @@ command_docs = {
 def handle_echo(args, stdout=None):
     """Handle the echo builtin command."""
     stdout = stdout or sys.stdout
-    print(' '.join(args), file=stdout)
+    # One write instead of print's payload+newline pair - halves the
+    # stream-lock round trips, which shows up under redirection
+    stdout.write(' '.join(args) + '\n')
 
 
 def handle_type(arg, stdout=None):
@@ -75,7 +77,7 @@ def handle_type(arg, stdout=None):
         print(f"{arg} is a shell builtin", file=stdout)
         return True
 
-    path = shutil.which(arg)
+    path = file_exists_in_path(arg)
     if path is None:
         print(f"{arg}: not found", file=stdout)
         return False
@@ -98,13 +100,23 @@ def handle_cd(arg, stderr=None):
     """
     arg = expand_path(arg)
 
-    if not os.path.isdir(arg):
-        stderr = stderr or sys.stderr
-        stderr.write(f"cd: {arg}: No such file or directory\n")
-        return False
+    # Attempt the chdir directly - a separate isdir() probe would just
+    # repeat the same kernel path walk on the success path
+    try:
+        os.chdir(arg)
+        return True
+    except FileNotFoundError:
+        reason = "No such file or directory"
+    except NotADirectoryError:
+        reason = "Not a directory"
+    except PermissionError:
+        reason = "Permission denied"
+    except OSError as e:
+        reason = e.strerror or str(e)
 
-    os.chdir(arg)
-    return True
+    stderr = stderr or sys.stderr
+    stderr.write(f"cd: {arg}: {reason}\n")
+    return False
 
 
 def handle_activate(args=None):
@@ -271,7 +283,8 @@ def run_builtin(cmd, args, stdout=None, stderr=None):
 
 def execute_builtin(segment=None, cmd=None, args=None,
                     stdout=None, stderr=None,
-                    close_stdout=False, result_holder=None):
+                    close_stdout=False, close_stderr=False,
+                    result_holder=None):
     """
     Execute a builtin command.
 
@@ -280,12 +293,13 @@ def execute_builtin(segment=None, cmd=None, args=None,
     2. With cmd/args/stdout/stderr (pipeline): uses provided file objects
 
     Args:
-        segment: Pipeline segment with 'parts', 'stdout_redirs', 'stderr_redirs'
+        segment: Pipeline Segment namedtuple (parts, stdout_redirs, stderr_redirs)
         cmd: Command name (used when segment is None)
         args: Command arguments (used when segment is None)
         stdout: Stdout file object (used when segment is None)
         stderr: Stderr file object (used when segment is None)
         close_stdout: If True, flush and close stdout after execution (for pipeline EOF)
+        close_stderr: If True, flush and close stderr after execution
         result_holder: Dict to store returncode (for threaded execution)
 
     Returns:
@@ -321,5 +335,12 @@ def execute_builtin(segment=None, cmd=None, args=None,
         elif owns_files:
             if stdout:
                 stdout.close()
+        if close_stderr and stderr and stderr not in (sys.stdout, sys.stderr):
+            try:
+                stderr.flush()
+                stderr.close()
+            except:
+                pass
+        elif owns_files:
             if stderr:
                 stderr.close()
@@ -0,0 +1,231 @@
+"""
+Command resolution against $PATH.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Per-directory executable index: {directory: (mtime_ns, {name: full_path})}
+# Mirrors the hash table real shells keep, revalidated by directory mtime
+_path_cache = {}
+_path_env = None
+_path_dirs = ()
+
+# Successful {name: full_path} resolutions - the equivalent of the POSIX
+# shell `hash` table. Cleared whenever $PATH changes or a directory index
+# rebuild is observed (lazily during lookups, eagerly on warm passes).
+# Like `hash`, a hit is trusted without re-statting its directory, so a
+# removed executable is only noticed once any revalidation runs.
+_resolved = {}
+
+# Sorted listing of every executable name on $PATH, for completion, plus
+# per-first-character buckets so short prefixes jump straight to their
+# candidates; marked stale whenever any directory index is (re)built
+_names_sorted = ()
+_names_by_first = {}
+_names_stale = True
+
+
+def _check_path_env():
+    """
+    Get $PATH's directories as a tuple, re-splitting only when the
+    variable actually changes; stale caches are dropped on change.
+    """
+    global _path_env, _path_dirs, _names_stale
+    path_env = os.environ.get('PATH', '')
+    if path_env != _path_env:
+        _path_env = path_env
+        _path_dirs = tuple(
+            d for d in path_env.split(os.pathsep) if d)
+        _path_cache.clear()
+        _resolved.clear()
+        _names_stale = True
+    return _path_dirs
+
+
+# On Windows executability is a matter of extension, not mode bits -
+# os.access(X_OK) is both slow and meaningless against NTFS ACLs
+_IS_WINDOWS = os.name == 'nt'
+_PATHEXT = tuple(
+    ext.lower()
+    for ext in os.environ.get('PATHEXT', '.COM;.EXE;.BAT;.CMD').split(os.pathsep)
+    if ext
+)
+
+
+def is_executable_entry(entry):
+    """Check a scandir entry for an executable regular file."""
+    try:
+        if _IS_WINDOWS:
+            return entry.is_file() and entry.name.lower().endswith(_PATHEXT)
+        return entry.is_file() and entry.stat().st_mode & 0o111
+    except OSError:
+        return False
+
+
+def list_executables(directory):
+    """Build a {name: full_path} index of executables in one directory."""
+    try:
+        with os.scandir(directory) as entries:
+            if _IS_WINDOWS:
+                # NTFS resolves names case-insensitively - key the index
+                # by lowered name so lookups match regardless of typed or
+                # on-disk case (paths keep their on-disk spelling)
+                return {
+                    entry.name.lower(): entry.path
+                    for entry in entries
+                    if is_executable_entry(entry)
+                }
+            return {
+                entry.name: entry.path
+                for entry in entries
+                if is_executable_entry(entry)
+            }
+    except OSError:
+        return {}
+
+
+def lookup_windows_name(index, name):
+    """
+    Probe a directory index for a typed command name on Windows.
+
+    Matches case-insensitively and, for bare names, also tries each
+    PATHEXT extension the way shutil.which and cmd.exe resolution do.
+    """
+    lowered = name.lower()
+    path = index.get(lowered)
+    if path:
+        return path
+    if not lowered.endswith(_PATHEXT):
+        for ext in _PATHEXT:
+            path = index.get(lowered + ext)
+            if path:
+                return path
+    return None
+
+
+def warm_path_cache():
+    """
+    Eagerly index every $PATH directory.
+
+    Called once at shell startup so the first command dispatch and tab
+    completion hit warm dict lookups instead of paying the full PATH scan.
+    """
+    global _names_stale
+
+    stale = []
+    for directory in _check_path_env():
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            continue
+        cached = _path_cache.get(directory)
+        if cached is None or cached[0] != mtime:
+            stale.append((directory, mtime))
+
+    if not stale:
+        return
+    _names_stale = True
+    # Rebuilt indexes may drop entries the memo still points at
+    _resolved.clear()
+
+    # Directory scans are I/O-bound and release the GIL; on a cold start
+    # with many PATH entries, scanning in parallel turns the wall time
+    # into max(dir) instead of sum(dirs)
+    if len(stale) >= 4:
+        with ThreadPoolExecutor(max_workers=min(16, len(stale))) as executor:
+            indexes = executor.map(
+                list_executables, [directory for directory, _ in stale])
+            for (directory, mtime), index in zip(stale, indexes):
+                _path_cache[directory] = (mtime, index)
+    else:
+        for directory, mtime in stale:
+            _path_cache[directory] = (mtime, list_executables(directory))
+
+
+def executable_names():
+    """
+    Get the sorted tuple of every executable name on $PATH.
+
+    Revalidates the per-directory indexes by mtime and rebuilds the
+    sorted listing only when one of them actually changed, so steady-state
+    completion queries cost a handful of stat calls and no directory scans.
+    """
+    global _names_stale, _names_sorted, _names_by_first
+    warm_path_cache()
+    if _names_stale:
+        names = set()
+        for _, index in _path_cache.values():
+            names.update(index)
+        _names_sorted = tuple(sorted(names))
+
+        buckets = {}
+        for name in _names_sorted:
+            buckets.setdefault(name[0], []).append(name)
+        _names_by_first = {char: tuple(bucket)
+                           for char, bucket in buckets.items()}
+
+        _names_stale = False
+    return _names_sorted
+
+
+def executable_names_for_prefix(prefix):
+    """
+    Get the sorted executable names sharing prefix's first character.
+
+    Buckets are tiny compared to the full listing, so prefix completion
+    scans a fraction of the namespace (and stays sorted for bisecting).
+    """
+    names = executable_names()
+    if not prefix:
+        return names
+    return _names_by_first.get(prefix[0], ())
+
+
+def file_exists_in_path(name):
+    """
+    Resolve a command name against $PATH.
+
+    Directory listings are cached and revalidated via the directory's
+    mtime, so repeated lookups cost dict probes instead of a stat+access
+    per PATH entry.
+
+    Returns:
+        Full path to the executable, or None if not found
+    """
+    global _names_stale
+
+    if os.sep in name or (os.altsep and os.altsep in name):
+        # Explicit path - no PATH search involved
+        if os.path.isfile(name) and os.access(name, os.X_OK):
+            return name
+        return None
+
+    path_dirs = _check_path_env()
+
+    hit = _resolved.get(name)
+    if hit is not None:
+        return hit
+
+    for directory in path_dirs:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            continue
+
+        cached = _path_cache.get(directory)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, list_executables(directory))
+            _path_cache[directory] = cached
+            _resolved.clear()
+            _names_stale = True
+
+        if _IS_WINDOWS:
+            path = lookup_windows_name(cached[1], name)
+        else:
+            path = cached[1].get(name)
+        if path:
+            _resolved[name] = path
+            return path
+
+    return None
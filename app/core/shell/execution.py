@@ -1,25 +1,54 @@
+import os
 import subprocess
 import sys
+from functools import lru_cache
 from io import StringIO
-from ...parsing import parse_pipeline_into_segments, parse_segment, update_quote_state
-from ...types import is_builtin
+from ...parsing import Segment, parse_pipeline_into_segments, parse_segment
+from ...types import BUILTIN_NAMES
 from ...commands import execute_builtin
 from .pipeline import execute_pipeline, execute_pipeline_captured
 
+# Characters that require the full tokenizer/pipeline parser
+SPECIAL_SHELL_CHARS = frozenset('|&<>;\n"\'$\\')
+
+
+@lru_cache(maxsize=512)
+def parse_pipeline_cached(command):
+    """
+    Memoized pipeline parse for repeated identical commands.
+
+    Safe because segments are treated as read-only by all consumers and
+    path expansion / redirect priming happen at execution time, not here.
+    """
+    return parse_pipeline_into_segments(command)
+
 
 def split_on_unquoted_newlines(command):
     """Split command on newlines that are outside quotes."""
+    # Single-line commands need no scan at all
+    if '\n' not in command:
+        return [command]
+
+    # Quote state is tracked inline - a helper call per character would
+    # dominate this loop
     lines = []
     current = []
+    append_char = current.append
     in_single = in_double = False
 
     for char in command:
-        in_single, in_double = update_quote_state(char, in_single, in_double)
-        if char == '\n' and not in_single and not in_double:
+        if char == "'":
+            if not in_double:
+                in_single = not in_single
+        elif char == '"':
+            if not in_single:
+                in_double = not in_double
+        elif char == '\n' and not in_single and not in_double:
             lines.append(''.join(current))
             current = []
-        else:
-            current.append(char)
+            append_char = current.append
+            continue
+        append_char(char)
 
     if current:
         lines.append(''.join(current))
@@ -30,12 +59,11 @@ def execute_shell_captured(pipeline, command):
     """Execute shell command in capture mode, returning output."""
     if len(pipeline) == 1:
         segment = pipeline[0]
-        cmd = segment['parts'][0] if segment['parts'] else None
+        cmd = segment.parts[0] if segment.parts else None
 
         # Check if builtin first
-        if is_builtin(cmd):
-            has_redirects = segment.get(
-                'stdout_redirs') or segment.get('stderr_redirs')
+        if cmd in BUILTIN_NAMES:
+            has_redirects = segment.stdout_redirs or segment.stderr_redirs
 
             if has_redirects:
                 _, returncode = execute_builtin(segment=segment)
@@ -62,10 +90,10 @@ def execute_shell_captured(pipeline, command):
 
 def execute_single_shell_command(segment):
     """Execute a single shell command (builtin or external)."""
-    cmd = segment['parts'][0] if segment['parts'] else None
+    cmd = segment.parts[0] if segment.parts else None
 
     # Check if builtin
-    if is_builtin(cmd):
+    if cmd in BUILTIN_NAMES:
         return execute_builtin(segment)
 
     # Execute external command
@@ -89,7 +117,15 @@ def execute_shell(command, capture=False):
         If capture=False: (should_exit, returncode) tuple
         If capture=True: (returncode, stdout, stderr) tuple
     """
-    pipeline = parse_pipeline_into_segments(command)
+    # Fast path: simple commands with no quoting, pipes or redirections
+    # don't need the tokenizer at all. Whitespace-only input (reachable
+    # via blank substitutions like $( )) must yield an empty pipeline,
+    # matching the parser, not a segment with no parts.
+    parts = command.split() if SPECIAL_SHELL_CHARS.isdisjoint(command) else None
+    if parts:
+        pipeline = [Segment(parts, [], [])]
+    else:
+        pipeline = parse_pipeline_cached(command)
 
     # Capture mode - return output
     if capture:
@@ -107,11 +143,15 @@ def execute_shell(command, capture=False):
 def execute_external_captured(cmd, args):
     """Execute external command in capture mode, returning output."""
     try:
+        # close_fds=False lets subprocess use posix_spawn/vfork instead of
+        # fork+exec, skipping the page-table copy that dominates short
+        # commands; our fds are non-inheritable so nothing leaks anyway
         result = subprocess.run(
             [cmd] + args,
             capture_output=True,
             text=True,
-            timeout=300
+            timeout=300,
+            close_fds=False
         )
         return (result.returncode, result.stdout, result.stderr)
     except FileNotFoundError:
@@ -120,43 +160,93 @@ def execute_external_captured(cmd, args):
         return (130, '', '')
 
 
-def open_redirect_file_handles(stdout_spec, stderr_spec):
+def open_spec_fd(spec):
+    """Open a raw write fd for a ('/path', mode) redirect spec."""
+    flags = os.O_WRONLY | os.O_CREAT
+    flags |= os.O_APPEND if spec[1] == 'a' else os.O_TRUNC
+    return os.open(spec[0], flags, 0o644)
+
+
+def open_redirect_fds(stdout_spec, stderr_spec):
     """
-    Open file handles for stdout/stderr redirect specs.
+    Open raw fds for stdout/stderr redirect specs.
 
     Args:
         stdout_spec: Tuple like ('/path', 'w') or None
         stderr_spec: Tuple like ('/path', 'w') or None
 
     Returns:
-        (stdout_handle, stderr_handle, error) tuple
-        Handles are open file objects or None, error is exception or None
+        (stdout_fd, stderr_fd, error) tuple
+        Fds are ints or None, error is exception or None
     """
-    stdout_arg = None
-    stderr_arg = None
+    stdout_fd = None
+    stderr_fd = None
 
     try:
         if stdout_spec:
-            stdout_arg = open(stdout_spec[0], stdout_spec[1])
+            stdout_fd = open_spec_fd(stdout_spec)
         if stderr_spec:
-            stderr_arg = open(stderr_spec[0], stderr_spec[1])
-        return (stdout_arg, stderr_arg, None)
-    except (FileNotFoundError, PermissionError, OSError) as e:
-        # Clean up any opened handles on error
-        if stdout_arg:
-            stdout_arg.close()
-        if stderr_arg:
-            stderr_arg.close()
+            stderr_fd = open_spec_fd(stderr_spec)
+        return (stdout_fd, stderr_fd, None)
+    except OSError as e:
+        # Clean up any opened fd on error
+        if stdout_fd is not None:
+            os.close(stdout_fd)
         return (None, None, e)
 
 
+def run_external_posix_spawn(cmd, args, stdout_fd, stderr_fd):
+    """
+    Launch an external command with os.posix_spawnp (POSIX fast path).
+
+    posix_spawn skips fork()'s page-table duplication entirely; redirects
+    are applied in the child via dup2 file_actions.
+    """
+    file_actions = []
+    if stdout_fd is not None:
+        file_actions.append((os.POSIX_SPAWN_DUP2, stdout_fd, 1))
+    if stderr_fd is not None:
+        file_actions.append((os.POSIX_SPAWN_DUP2, stderr_fd, 2))
+
+    try:
+        pid = os.posix_spawnp(
+            cmd, [cmd] + args, os.environ, file_actions=file_actions)
+    except FileNotFoundError:
+        return None
+    except PermissionError:
+        print(f"{cmd}: Permission denied", file=sys.stderr)
+        return 126
+    except OSError as e:
+        print(f"{cmd}: {e}", file=sys.stderr)
+        return 126
+
+    interrupted = False
+    while True:
+        try:
+            _, status = os.waitpid(pid, 0)
+            break
+        except KeyboardInterrupt:
+            # The foreground child received the SIGINT too; keep waiting
+            # until it actually exits, like a real shell. Returning early
+            # would leave the child fighting for the terminal and leak a
+            # zombie, since nothing else ever reaps this pid.
+            interrupted = True
+
+    returncode = os.waitstatus_to_exitcode(status)
+    if interrupted and returncode < 0:
+        # Child died of the signal - report it shell-style
+        return 130
+    return returncode
+
+
 def run_subprocess_with_redirects(cmd, args, stdout_arg, stderr_arg):
-    """Run subprocess with redirect file handles."""
+    """Run subprocess with redirect fds (fallback for non-POSIX platforms)."""
     try:
         result = subprocess.run(
             [cmd] + args,
             stdout=stdout_arg,
-            stderr=stderr_arg
+            stderr=stderr_arg,
+            close_fds=False
         )
         return result.returncode
     except FileNotFoundError:
@@ -176,7 +266,7 @@ def execute_external(segment, capture=False):
     Execute a single external command with redirects (no fork needed).
 
     Args:
-        segment: Pipeline segment with 'parts', 'stdout_redirs', 'stderr_redirs'
+        segment: Pipeline Segment namedtuple
         capture: If True, capture and return (returncode, stdout, stderr) as strings
 
     Returns:
@@ -191,19 +281,21 @@ def execute_external(segment, capture=False):
     if capture:
         return execute_external_captured(cmd, args)
 
-    # Open file handles for redirects
-    stdout_arg, stderr_arg, error = open_redirect_file_handles(
-        stdout_spec, stderr_spec)
+    # Open raw fds for redirects (in the parent, so open errors are
+    # reported precisely instead of surfacing as spawn failures)
+    stdout_fd, stderr_fd, error = open_redirect_fds(stdout_spec, stderr_spec)
     if error:
         print(f"Redirect error: {error}", file=sys.stderr)
         return 1
 
     # Run the command with redirects
     try:
-        return run_subprocess_with_redirects(cmd, args, stdout_arg, stderr_arg)
+        if hasattr(os, 'posix_spawnp'):
+            return run_external_posix_spawn(cmd, args, stdout_fd, stderr_fd)
+        return run_subprocess_with_redirects(cmd, args, stdout_fd, stderr_fd)
     finally:
-        # Always close file handles
-        if stdout_arg:
-            stdout_arg.close()
-        if stderr_arg:
-            stderr_arg.close()
+        # Always close the parent's copies
+        if stdout_fd is not None:
+            os.close(stdout_fd)
+        if stderr_fd is not None:
+            os.close(stderr_fd)
@@ -1,5 +1,7 @@
 import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from ..utils import get_caller_scope
 from ..python import execute_python
 from .execution import execute_shell, split_on_unquoted_newlines
@@ -7,6 +9,9 @@ from ...parsing import find_matching_paren
 from ...types import CommandResult
 
 
+_REDIR_RE = re.compile(r'\s+>>?\s+|\s+2>>?\s+|\s+&>>?\s+')
+
+
 def has_redirections(cmd):
     """
     Check if command has output redirections (>, >>, 2>, etc.).
@@ -14,9 +19,13 @@ def has_redirections(cmd):
     Returns:
         True if command has redirections that would be ignored in capture mode
     """
+    # Cheap memchr scan first - most commands have no '>' at all
+    if '>' not in cmd:
+        return False
+
     # Simple check for common redirection operators
     # Don't need perfect parsing - just detect if we should avoid capture mode
-    return bool(re.search(r'\s+>>?\s+|\s+2>>?\s+|\s+&>>?\s+', cmd))
+    return _REDIR_RE.search(cmd) is not None
 
 
 def expand_at(value):
@@ -29,19 +38,64 @@ def expand_at(value):
     Returns:
         String representation of the value, with lists/tuples joined by spaces
     """
-    # Handle lists and tuples specially - join with spaces for shell
+    # Handle lists and tuples specially - join with spaces for shell.
+    # map(str, ...) feeds join from C without a generator frame per item
     if isinstance(value, (list, tuple)):
-        if len(value) == 0:
-            return ''
-        return ' '.join(str(item) for item in value)
+        return ' '.join(map(str, value))
 
     return str(value)
 
 
+# Pool for running independent sibling substitutions concurrently; created
+# lazily so plain shell use never spawns threads
+_substitution_pool = None
+_in_substitution_worker = threading.local()
+
+
+def get_substitution_pool():
+    """Get the shared executor for concurrent substitutions."""
+    global _substitution_pool
+    if _substitution_pool is None:
+        _substitution_pool = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix='pynix-subst')
+    return _substitution_pool
+
+
+def run_shell_substitution(content, scope):
+    """Expand and execute a single $()/!() substitution, returning stdout."""
+    previous = getattr(_in_substitution_worker, 'active', False)
+    _in_substitution_worker.active = True
+    try:
+        expanded_cmd = expand_nested_substitutions(content, scope)
+        _, stdout, _ = execute_shell(expanded_cmd, capture=True)
+        return stdout.strip() if stdout else ''
+    finally:
+        _in_substitution_worker.active = previous
+
+
+def find_next_marker(text, start):
+    """
+    Find the earliest @(, $(, !( marker at or after start.
+
+    Returns:
+        Index of the marker, or -1 if none remain
+    """
+    nxt = -1
+    for marker in ('@(', '$(', '!('):
+        j = text.find(marker, start)
+        if j != -1 and (nxt == -1 or j < nxt):
+            nxt = j
+    return nxt
+
+
 def expand_nested_substitutions(text, scope):
     """
     Expand @(), $(), !() patterns in text recursively.
 
+    Scans with str.find to jump between markers and accumulates output
+    chunks in a list, avoiding per-character stepping and quadratic
+    string rebuilds on long templates.
+
     Args:
         text: String that may contain @(), $(), !() patterns
         scope: Dictionary of variables for eval()
@@ -49,58 +103,79 @@ def expand_nested_substitutions(text, scope):
     Returns:
         String with all patterns expanded
     """
-    result = text
-    offset = 0
-    i = 0
-
-    while i < len(result):
-        if i < len(result) - 1:
-            two_char = result[i:i+2]
-            if two_char in ('@(', '$(', '!('):
-                close_paren = find_matching_paren(result, i + 1)
-
-                if close_paren != -1:
-                    operator = two_char[0]
-                    content = result[i+2:close_paren]
-
-                    try:
-                        if operator == '@':
-                            # Recursively expand nested patterns first
-                            expanded_content = expand_nested_substitutions(
-                                content, scope)
-                            # Python expression
-                            value = execute_python(
-                                expanded_content, namespace=scope, interactive=False)
-                            replacement = expand_at(value)
-                        else:  # $ or !
-                            expanded_cmd = expand_nested_substitutions(
-                                content, scope)
-                            _, stdout, _ = execute_shell(
-                                expanded_cmd, capture=True)
-                            replacement = stdout.strip() if stdout else ''
-                    except Exception as e:
-                        error_msg = str(e)
-                        if "Error evaluating" in error_msg:
-                            # Strip the wrapper from execute_python
-                            error_msg = error_msg.split(": ", 1)[-1]
-
-                        raise RuntimeError(
-                            f"{operator}({content}): {error_msg}") from None
-
-                    # Replace in result
-                    start = i
-                    end = close_paren + 1
-                    result = result[:start] + replacement + result[end:]
-
-                    # Continue searching from after the replacement
-                    i = start + len(replacement)
-                    continue
-        i += 1
-
-    return result
-
-
-def execute_multiline_shell(lines, capture):
+    # Most commands contain no expansion at all - skip the scan entirely
+    if '(' not in text:
+        return text
+
+    # Collect the top-level expansions first: (start, end, operator, content)
+    jobs = []
+    search = 0
+    while True:
+        start = find_next_marker(text, search)
+        if start == -1:
+            break
+
+        close_paren = find_matching_paren(text, start + 1)
+        if close_paren == -1:
+            # Unmatched paren - leave the marker alone and keep scanning
+            search = start + 1
+            continue
+
+        jobs.append((start, close_paren + 1,
+                     text[start], text[start+2:close_paren]))
+        search = close_paren + 1
+
+    if not jobs:
+        return text
+
+    # Sibling $()/!() substitutions are independent - overlap their
+    # subprocess latencies on the pool. @() stays on this thread (it needs
+    # the caller's scope semantics), and workers never re-submit so nested
+    # expansions can't starve the pool.
+    futures = {}
+    shell_jobs = [job for job in jobs if job[2] != '@']
+    if len(shell_jobs) > 1 and not getattr(_in_substitution_worker, 'active', False):
+        pool = get_substitution_pool()
+        for job in shell_jobs:
+            futures[job] = pool.submit(run_shell_substitution, job[3], scope)
+
+    chunks = []
+    emitted = 0  # text before this index is already in chunks
+
+    for job in jobs:
+        start, end, operator, content = job
+
+        try:
+            if operator == '@':
+                # Recursively expand nested patterns first
+                expanded_content = expand_nested_substitutions(
+                    content, scope)
+                # Python expression
+                value = execute_python(
+                    expanded_content, namespace=scope, interactive=False)
+                replacement = expand_at(value)
+            elif job in futures:
+                replacement = futures[job].result()
+            else:  # lone $ or ! - run inline
+                replacement = run_shell_substitution(content, scope)
+        except Exception as e:
+            error_msg = str(e)
+            if "Error evaluating" in error_msg:
+                # Strip the wrapper from execute_python
+                error_msg = error_msg.split(": ", 1)[-1]
+
+            raise RuntimeError(
+                f"{operator}({content}): {error_msg}") from None
+
+        chunks.append(text[emitted:start])
+        chunks.append(replacement)
+        emitted = end
+
+    chunks.append(text[emitted:])
+    return ''.join(chunks)
+
+
+def execute_multiline_shell(lines, capture, caller_globals=None):
     """Execute multiple shell lines, handling capture modes appropriately."""
     if capture == 'stdout':
         all_stdout = []
@@ -126,8 +201,8 @@ def execute_multiline_shell(lines, capture):
             if should_exit:
                 sys.exit(returncode)
         # Store final returncode
-        caller_frame = sys._getframe(2)  # skip this func and shell()
-        caller_frame.f_globals['__last_returncode__'] = last_returncode
+        if caller_globals is not None:
+            caller_globals['__last_returncode__'] = last_returncode
         return None
 
 
@@ -144,7 +219,9 @@ def shell(cmd_template, capture=None):
     Returns:
         None, str, or CommandResult depending on capture mode
     """
-    # Get caller's scope for expanding patterns
+    # Read the caller's frame once - its globals receive __last_returncode__
+    # and its scope feeds pattern expansion
+    caller_globals = sys._getframe(1).f_globals
     scope = get_caller_scope()
 
     # Expand all patterns recursively
@@ -155,7 +232,7 @@ def shell(cmd_template, capture=None):
         lines = split_on_unquoted_newlines(cmd)
         lines = [ln.strip() for ln in lines if ln.strip()]
         if len(lines) > 1:
-            return execute_multiline_shell(lines, capture)
+            return execute_multiline_shell(lines, capture, caller_globals)
 
     # Handle redirections (can't capture when output goes to file)
     if has_redirections(cmd):
@@ -163,8 +240,7 @@ def shell(cmd_template, capture=None):
 
         if capture is None:
             # Store returncode in caller's namespace for $? and && ||
-            caller_frame = sys._getframe(1)
-            caller_frame.f_globals['__last_returncode__'] = returncode
+            caller_globals['__last_returncode__'] = returncode
             if should_exit:
                 sys.exit(returncode)
             return None
@@ -177,8 +253,7 @@ def shell(cmd_template, capture=None):
     if capture is None:
         # Standalone command - display output, store returncode
         should_exit, returncode = execute_shell(cmd, capture=False)
-        caller_frame = sys._getframe(1)
-        caller_frame.f_globals['__last_returncode__'] = returncode
+        caller_globals['__last_returncode__'] = returncode
         if should_exit:
             sys.exit(returncode)
         return None
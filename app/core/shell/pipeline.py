@@ -1,23 +1,69 @@
 import sys
 import os
-import shlex
+import re
 import subprocess
 import threading
 from ...parsing import prepare_redirect_specs, expand_path
-from ...types import Command, is_builtin
+from ...types import BUILTIN_NAMES, Command
 from ...commands import execute_builtin
 
 
+# Same safe-character set shlex.quote uses, precompiled once; most argv
+# parts need no quoting so the common case is a single C-level scan
+_SHELL_UNSAFE = re.compile(r'[^\w@%+=:,./-]', re.ASCII).search
+
+
+def quote_shell_part(part):
+    """Quote an argv part for /bin/sh (inlined shlex.quote fast path)."""
+    if part and not _SHELL_UNSAFE(part):
+        return part
+    return "'" + part.replace("'", "'\"'\"'") + "'"
+
+
 def build_shell_command(pipeline):
     """Build a shell command string from pipeline segments."""
     commands = []
     for segment in pipeline:
-        cmd_str = ' '.join(shlex.quote(part) for part in segment['parts'])
+        cmd_str = ' '.join(quote_shell_part(part)
+                           for part in segment.parts)
         if cmd_str:
             commands.append(cmd_str)
     return ' | '.join(commands) if commands else ''
 
 
+# Reusable capture buffers - long-running REPLs that capture lots of
+# output reuse these instead of growing a fresh bytearray per call
+_capture_buffer_pool = []
+_CAPTURE_POOL_SIZE = 4
+_CAPTURE_CHUNK = 65536
+
+
+def acquire_capture_buffer():
+    """Get an empty bytearray from the pool (or a fresh one)."""
+    try:
+        return _capture_buffer_pool.pop()
+    except IndexError:
+        return bytearray()
+
+
+def release_capture_buffer(buf):
+    """Clear a capture buffer and return it to the bounded pool."""
+    if len(_capture_buffer_pool) < _CAPTURE_POOL_SIZE:
+        del buf[:]
+        _capture_buffer_pool.append(buf)
+
+
+def drain_stream_into(stream, buf):
+    """Read a byte stream to EOF into buf in large chunks, then close it."""
+    read = stream.read
+    while True:
+        chunk = read(_CAPTURE_CHUNK)
+        if not chunk:
+            break
+        buf += chunk
+    stream.close()
+
+
 def execute_pipeline_captured(pipeline):
     """
     Execute a pipeline and capture final output.
@@ -35,13 +81,44 @@ def execute_pipeline_captured(pipeline):
     if not full_command:
         return (0, '', '')
 
-    result = subprocess.run(
+    # Capture raw bytes into pooled buffers and decode once at the end -
+    # for large outputs this beats text mode's incremental decoding and
+    # avoids reallocating multi-MB buffers on every call
+    # close_fds=False enables subprocess's posix_spawn/vfork fast path
+    proc = subprocess.Popen(
         full_command,
         shell=True,
-        capture_output=True,
-        text=True
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        close_fds=False
     )
-    return (result.returncode, result.stdout, result.stderr)
+
+    stdout_buf = acquire_capture_buffer()
+    stderr_buf = acquire_capture_buffer()
+
+    # Drain stderr on a thread while the main thread drains stdout so a
+    # full stderr pipe can't deadlock the child
+    stderr_thread = threading.Thread(
+        target=drain_stream_into, args=(proc.stderr, stderr_buf))
+    stderr_thread.start()
+    drain_stream_into(proc.stdout, stdout_buf)
+    stderr_thread.join()
+    returncode = proc.wait()
+
+    try:
+        return (
+            returncode,
+            stdout_buf.decode('utf-8', 'replace'),
+            stderr_buf.decode('utf-8', 'replace'),
+        )
+    finally:
+        release_capture_buffer(stdout_buf)
+        release_capture_buffer(stderr_buf)
+
+
+# Builtins that mutate shell state and therefore can't run in a pipeline;
+# prebuilt so validation does one hash probe per segment
+PIPELINE_UNSAFE_BUILTINS = frozenset((Command.CD, Command.EXIT))
 
 
 def validate_pipeline_commands(pipeline):
@@ -50,8 +127,8 @@ def validate_pipeline_commands(pipeline):
         return True
 
     for segment in pipeline:
-        cmd = segment['parts'][0] if segment['parts'] else None
-        if cmd in (Command.CD, Command.EXIT):
+        cmd = segment.parts[0] if segment.parts else None
+        if cmd in PIPELINE_UNSAFE_BUILTINS:
             print(f"{cmd}: cannot be used in pipeline", file=sys.stderr)
             return False
     return True
@@ -77,49 +154,58 @@ def get_stdin_for_command(i, pipes):
     return pipes[i-1][0]  # Read from previous pipe
 
 
-def get_stdout_for_command(i, n_commands, pipes, stdout_spec, redirect_files):
+def open_redirect_fd(spec, redirect_fds):
+    """Open a raw write fd for a redirect spec and track it for cleanup."""
+    flags = os.O_WRONLY | os.O_CREAT
+    flags |= os.O_APPEND if spec[1] == 'a' else os.O_TRUNC
+    fd = os.open(spec[0], flags, 0o644)
+    redirect_fds.append(fd)
+    return fd
+
+
+def get_stdout_for_command(i, n_commands, pipes, stdout_spec, redirect_fds):
     """Get stdout file descriptor/arg for command at position i."""
     if i == n_commands - 1:
         # Last command
         if stdout_spec:
-            stdout_arg = open(stdout_spec[0], stdout_spec[1])
-            redirect_files.append(stdout_arg)
-            return stdout_arg
+            return open_redirect_fd(stdout_spec, redirect_fds)
         return None  # Write to terminal
 
     # Not last command - write to next pipe
     return pipes[i][1]
 
 
-def get_stderr_for_command(i, n_commands, stderr_spec, redirect_files):
+def get_stderr_for_command(i, n_commands, stderr_spec, redirect_fds):
     """Get stderr file descriptor/arg for last command in pipeline."""
     # Last command
     if i == n_commands - 1 and stderr_spec:
-        stderr_arg = open(stderr_spec[0], stderr_spec[1])
-        redirect_files.append(stderr_arg)
-        return stderr_arg
+        return open_redirect_fd(stderr_spec, redirect_fds)
 
     return None
 
 
-def fd_to_file_object(fd, mode, pipe_fds):
-    """Convert file descriptor to file object, removing from pipe_fds tracking."""
+def fd_to_file_object(fd, mode, pipe_fds, redirect_fds):
+    """Convert file descriptor to file object, removing from fd tracking."""
     if fd is None:
         return None
     if isinstance(fd, int):
         file_obj = os.fdopen(fd, mode)
+        # os.fdopen takes ownership - stop tracking the raw fd
         if fd in pipe_fds:
-            pipe_fds.remove(fd)  # os.fdopen takes ownership
+            pipe_fds.remove(fd)
+        if fd in redirect_fds:
+            redirect_fds.remove(fd)
         return file_obj
     return fd  # Already a file object
 
 
-def execute_builtin_in_pipeline(cmd, args, stdin_arg, stdout_arg, stderr_arg, pipe_fds):
+def execute_builtin_in_pipeline(cmd, args, stdin_arg, stdout_arg, stderr_arg,
+                                pipe_fds, redirect_fds):
     """Execute a builtin command in the pipeline using a thread."""
     # Convert fds to file objects
-    stdin_file = fd_to_file_object(stdin_arg, 'r', pipe_fds)
-    stdout_file = fd_to_file_object(stdout_arg, 'w', pipe_fds)
-    stderr_file = stderr_arg
+    stdin_file = fd_to_file_object(stdin_arg, 'r', pipe_fds, redirect_fds)
+    stdout_file = fd_to_file_object(stdout_arg, 'w', pipe_fds, redirect_fds)
+    stderr_file = fd_to_file_object(stderr_arg, 'w', pipe_fds, redirect_fds)
 
     result_holder = {'returncode': 0}
     thread = threading.Thread(
@@ -130,6 +216,7 @@ def execute_builtin_in_pipeline(cmd, args, stdin_arg, stdout_arg, stderr_arg, pi
             'stdout': stdout_file,
             'stderr': stderr_file,
             'close_stdout': True,
+            'close_stderr': stderr_file is not stderr_arg,
             'result_holder': result_holder,
         }
     )
@@ -145,20 +232,21 @@ def close_parent_pipe_fds(stdin_arg, stdout_arg, pipe_fds):
             pipe_fds.remove(fd)
 
 
-def execute_external_in_pipeline(cmd, args, stdin_arg, stdout_arg, stderr_arg, pipe_fds):
+def execute_external_in_pipeline(argv, stdin_arg, stdout_arg, stderr_arg, pipe_fds):
     """Execute an external command in the pipeline using subprocess.Popen."""
     try:
         proc = subprocess.Popen(
-            [cmd] + args,
+            argv,
             stdin=stdin_arg,
             stdout=stdout_arg,
-            stderr=stderr_arg
+            stderr=stderr_arg,
+            close_fds=False
         )
         # Close parent's copies of pipe fds (subprocess creates its own copies)
         close_parent_pipe_fds(stdin_arg, stdout_arg, pipe_fds)
         return proc
     except FileNotFoundError:
-        print(f"{cmd}: command not found", file=sys.stderr)
+        print(f"{argv[0]}: command not found", file=sys.stderr)
         return None
 
 
@@ -171,11 +259,11 @@ def close_remaining_pipe_fds(pipe_fds):
             pass
 
 
-def close_redirect_files(redirect_files):
-    """Close all opened redirect file objects."""
-    for f in redirect_files:
+def close_redirect_fds(redirect_fds):
+    """Close all raw redirect file descriptors still owned by the parent."""
+    for fd in redirect_fds:
         try:
-            f.close()
+            os.close(fd)
         except OSError:
             pass
 
@@ -187,9 +275,22 @@ def wait_for_all_threads(threads):
 
 
 def wait_for_all_processes(processes):
-    """Wait for all external processes to complete."""
-    for proc in processes:
-        proc.wait()
+    """Wait for all external processes, reaping each as it completes."""
+    if len(processes) < 2:
+        for proc in processes:
+            proc.wait()
+        return
+
+    # One waiter thread per process: each proc.wait() reaps only its own
+    # pid, so fast stages are released the moment they exit without
+    # stealing exit statuses from children the shell doesn't own (user
+    # Popen objects in the REPL namespace, substitution workers) the way
+    # a waitpid(-1) loop would
+    waiters = [threading.Thread(target=proc.wait) for proc in processes]
+    for waiter in waiters:
+        waiter.start()
+    for waiter in waiters:
+        waiter.join()
 
 
 def get_pipeline_returncode(processes, threads):
@@ -224,41 +325,43 @@ def execute_pipeline(pipeline):
     n = len(pipeline)
     processes = []
     threads = []
-    redirect_files = []
+    redirect_fds = []
 
     # Create pipes for the pipeline
     pipes, pipe_fds = create_pipeline_pipes(n)
 
     # Execute each command in the pipeline
     for i, segment in enumerate(pipeline):
-        cmd_parts = segment['parts']
+        cmd_parts = segment.parts
         if not cmd_parts:
             continue
 
+        # Build argv once - Popen consumes it as-is, builtins slice off args
         cmd = cmd_parts[0]
-        args = [expand_path(arg) for arg in cmd_parts[1:]]
+        argv = [cmd, *(expand_path(arg) for arg in cmd_parts[1:])]
 
         # Get file redirects (>, >>, 2>, 2>>)
         stdout_spec, stderr_spec = prepare_redirect_specs(
-            segment['stdout_redirs'],
-            segment['stderr_redirs']
+            segment.stdout_redirs,
+            segment.stderr_redirs
         )
 
         # Determine I/O for this command
         stdin_arg = get_stdin_for_command(i, pipes)
         stdout_arg = get_stdout_for_command(
-            i, n, pipes, stdout_spec, redirect_files)
-        stderr_arg = get_stderr_for_command(i, n, stderr_spec, redirect_files)
+            i, n, pipes, stdout_spec, redirect_fds)
+        stderr_arg = get_stderr_for_command(i, n, stderr_spec, redirect_fds)
 
         # Execute the command (builtin or external)
-        if is_builtin(cmd):
+        if cmd in BUILTIN_NAMES:
             thread_result = execute_builtin_in_pipeline(
-                cmd, args, stdin_arg, stdout_arg, stderr_arg, pipe_fds
+                cmd, argv[1:], stdin_arg, stdout_arg, stderr_arg,
+                pipe_fds, redirect_fds
             )
             threads.append(thread_result)
         else:
             proc = execute_external_in_pipeline(
-                cmd, args, stdin_arg, stdout_arg, stderr_arg, pipe_fds
+                argv, stdin_arg, stdout_arg, stderr_arg, pipe_fds
             )
             if proc:
                 processes.append(proc)
@@ -267,6 +370,6 @@ def execute_pipeline(pipeline):
     close_remaining_pipe_fds(pipe_fds)
     wait_for_all_threads(threads)
     wait_for_all_processes(processes)
-    close_redirect_files(redirect_files)
+    close_redirect_fds(redirect_fds)
 
     return get_pipeline_returncode(processes, threads)
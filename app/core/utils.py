@@ -16,4 +16,13 @@ def get_caller_scope(depth=2):
         Dictionary with merged globals and locals (locals override globals)
     """
     caller_frame = sys._getframe(depth)
-    return {**caller_frame.f_globals, **caller_frame.f_locals}
+    caller_globals = caller_frame.f_globals
+    caller_locals = caller_frame.f_locals
+
+    # At module level (the normal REPL case) locals IS globals - skip the
+    # merge and hand back the namespace itself instead of copying hundreds
+    # of entries per call
+    if caller_locals is caller_globals:
+        return caller_globals
+
+    return {**caller_globals, **caller_locals}
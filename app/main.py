@@ -1,6 +1,7 @@
 from .core import run_command
 from .types import Command
 from .commands.builtins import HISTFILE
+from .commands.resolution import warm_path_cache
 from .ui import create_prompt_session, get_prompt
 
 
@@ -9,15 +10,22 @@ def main():
     builtin_commands = [c.value for c in Command]
     session = create_prompt_session(builtin_commands, histfile=HISTFILE)
 
+    # Index $PATH up front so the first dispatch/completion is warm
+    warm_path_cache()
+
     while True:
         try:
-            command = session.prompt(get_prompt()).strip()
+            raw = session.prompt(get_prompt())
         except KeyboardInterrupt:
             continue
         except EOFError:
             break
 
-        if command and run_command(command):
+        # Skip blank lines before paying for the strip() copy
+        if not raw or raw.isspace():
+            continue
+
+        if run_command(raw.strip()):
             break
 
 
@@ -1,5 +1,5 @@
 from .tokenizer import split_command_by_and_or, update_quote_state
-from .pipeline import parse_pipeline_into_segments
+from .pipeline import Segment, parse_pipeline_into_segments
 from .segments import parse_segment
 from .redirections import prepare_redirect_specs
 from .utils import expand_path
@@ -7,6 +7,7 @@ from .expansions import find_matching_paren
 from .ast_transform import transform_code_with_expansions
 
 __all__ = [
+    'Segment',
     'parse_pipeline_into_segments',
     'update_quote_state',
     'parse_segment',
@@ -1,6 +1,7 @@
 import ast
 import builtins as builtin_module
 import keyword
+from functools import lru_cache
 from .expansions import replace_expansions_with_placeholders, parse_expansion_content
 
 
@@ -19,43 +20,80 @@ class ExpansionTransformer(ast.NodeTransformer):
             content_ast = parse_expansion_content(content, operator)
 
             # Map operators to appropriate function calls
+            # Stamp locations on every constructed node up front so the
+            # transformed tree never needs a fix_missing_locations pass
+            loc = {'lineno': node.lineno, 'col_offset': node.col_offset}
+
             if operator == '@':
                 # @() uses __expand_at (formats already-evaluated value)
                 return ast.Call(
-                    func=ast.Name(id='__expand_at', ctx=ast.Load()),
+                    func=ast.Name(id='__expand_at', ctx=ast.Load(), **loc),
                     args=[content_ast],
                     keywords=[],
-                    lineno=node.lineno,
-                    col_offset=node.col_offset
+                    **loc
                 )
             elif operator == '$':
                 # $() uses __shell with capture='stdout'
                 return ast.Call(
-                    func=ast.Name(id='__shell', ctx=ast.Load()),
+                    func=ast.Name(id='__shell', ctx=ast.Load(), **loc),
                     args=[content_ast],
                     keywords=[ast.keyword(
-                        arg='capture', value=ast.Constant(value='stdout'))],
-                    lineno=node.lineno,
-                    col_offset=node.col_offset
+                        arg='capture',
+                        value=ast.Constant(value='stdout', **loc), **loc)],
+                    **loc
                 )
             elif operator == '!':
                 # !() uses __shell with capture='full'
                 return ast.Call(
-                    func=ast.Name(id='__shell', ctx=ast.Load()),
+                    func=ast.Name(id='__shell', ctx=ast.Load(), **loc),
                     args=[content_ast],
                     keywords=[ast.keyword(
-                        arg='capture', value=ast.Constant(value='full'))],
-                    lineno=node.lineno,
-                    col_offset=node.col_offset
+                        arg='capture',
+                        value=ast.Constant(value='full', **loc), **loc)],
+                    **loc
                 )
 
         return node
 
 
+# Shared transformer instance - it carries no state beyond the mapping,
+# which is rebound per transform, so one allocation serves every call
+_TRANSFORMER = ExpansionTransformer({})
+
+
+@lru_cache(maxsize=256)
+def _transform_cached(code, mode):
+    """
+    Parse, placeholder-replace, transform and unparse once per (code, mode).
+
+    Returns (candidate_names, transformed_source) where candidate_names is
+    the frozenset of names the shell heuristic must test against the live
+    namespace, or None when the code can never be a shell command. The
+    namespace check itself stays outside the cache because the set of
+    defined variables changes as the session evolves.
+    """
+    modified_code, mapping = replace_expansions_with_placeholders(code)
+    tree = ast.parse(modified_code, mode=mode)
+
+    candidate_names = shell_candidate_names(tree)
+
+    # No expansions (the common case) - nothing to transform, and the
+    # original source executes as-is without an unparse round trip
+    if not mapping:
+        return candidate_names, code
+
+    _TRANSFORMER.mapping = mapping
+    transformed_tree = _TRANSFORMER.visit(tree)
+    return candidate_names, ast.unparse(transformed_tree)
+
+
 def transform_code_with_expansions(code, mode='exec', namespace=None):
     """
     Transform code with $(), !(), @() into executable Python with runtime calls.
 
+    The expensive parse/transform/unparse pipeline is memoized per code
+    string; re-running a command from history skips it entirely.
+
     Args:
         code: Source code to transform
         mode: Parse mode ('exec', 'eval', 'single')
@@ -63,26 +101,18 @@ def transform_code_with_expansions(code, mode='exec', namespace=None):
     """
     code = code.strip()
 
-    # Step 1: Try to parse as Python
-    modified_code, mapping = replace_expansions_with_placeholders(code)
-
     try:
-        tree = ast.parse(modified_code, mode=mode)
-
-        if is_likely_shell_command(tree, namespace):
-            return f'__shell({repr(code)})'
-
-        # Valid Python - transform expansions
-        transformer = ExpansionTransformer(mapping)
-        transformed_tree = transformer.visit(tree)
-        ast.fix_missing_locations(transformed_tree)
-        return ast.unparse(transformed_tree)
-
+        candidate_names, transformed = _transform_cached(code, mode)
     except SyntaxError:
         if looks_like_python_syntax(code):
             raise
         return f'__shell({repr(code)})'
 
+    if candidate_names is not None and has_unknown_name(candidate_names, namespace):
+        return f'__shell({repr(code)})'
+
+    return transformed
+
 
 def looks_like_python_syntax(code):
     """
@@ -113,34 +143,53 @@ def looks_like_python_syntax(code):
     return False
 
 
-def is_likely_shell_command(tree, namespace=None):
+class NameCollector(ast.NodeVisitor):
+    """Collect every Name referenced in an expression in a single pass."""
+
+    def __init__(self):
+        self.names = set()
+
+    def visit_Name(self, node):
+        self.names.add(node.id)
+
+
+def shell_candidate_names(tree):
     """
-    Heuristic: detect if parsed Python is actually a shell command.
+    Collect the names the shell-command heuristic must check, or None if
+    the parsed code can never be a shell command.
 
     Args:
         tree: Parsed AST
-        namespace: Dict with current variables (globals merged with locals)
     """
-    if namespace is None:
-        namespace = {}
-
-    # Only check single expression statements
+    # Only single expression statements can be shell commands
     if len(tree.body) != 1 or not isinstance(tree.body[0], ast.Expr):
-        return False
+        return None
 
     expr = tree.body[0].value
 
     # Don't treat comprehensions as shell commands
     if isinstance(expr, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
-        return False
+        return None
 
     # Collect all names used in the expression
-    names = {node.id for node in ast.walk(expr) if isinstance(node, ast.Name)}
+    collector = NameCollector()
+    collector.visit(expr)
+    names = collector.names
 
-    if not names:
-        return False
+    return frozenset(names) if names else None
+
+
+def has_unknown_name(names, namespace):
+    """
+    Heuristic: does any collected name exist in neither the namespace nor
+    builtins? If so the code is likely a shell command.
 
-    # Check if ANY name doesn't exist in namespace
+    Args:
+        names: Names collected by shell_candidate_names
+        namespace: Dict with current variables (globals merged with locals)
+    """
+    if namespace is None:
+        namespace = {}
 
     for name in names:
         # Skip special names and placeholders
@@ -1,4 +1,40 @@
 import ast
+import re
+from functools import lru_cache
+
+# Expansion markers and parens are sparse in typical code, so scanning with
+# a precompiled regex (a C-level DFA) beats stepping per character in Python
+_MARKER_RE = re.compile(r'[$!@]\(')
+_PAREN_RE = re.compile(r'[()]')
+
+
+@lru_cache(maxsize=1024)
+def _find_expansions_cached(code):
+    """Scan code for expansions, memoized on the immutable string."""
+    expansions = []
+    pos = 0
+
+    while True:
+        match = _MARKER_RE.search(code, pos)
+        if match is None:
+            break
+
+        start = match.start()
+        close_paren = find_matching_paren(code, start + 1)
+        if close_paren == -1:
+            pos = start + 1
+            continue
+
+        expansions.append(
+            (code[start], code[start+2:close_paren], start, close_paren + 1))
+        pos = close_paren + 1
+
+    return tuple(expansions)
+
+
+def has_expansion_markers(code):
+    """Cheap prefilter: does code contain any $(, !( or @( marker at all?"""
+    return '$(' in code or '!(' in code or '@(' in code
 
 
 def find_expansions(code):
@@ -6,26 +42,12 @@ def find_expansions(code):
     Find all top-level $(), !(), @() expansions in code.
     Returns list of (operator, content, start, end).
     """
-    expansions = []
-    i = 0
-
-    while i < len(code):
-        if i < len(code) - 1:
-            two_char = code[i:i+2]
-            if two_char in ('$(', '!(', '@('):
-                close_paren = find_matching_paren(code, i + 1)
-
-                if close_paren != -1:
-                    operator = two_char[0]
-                    content = code[i+2:close_paren]
-                    expansions.append((operator, content, i, close_paren + 1))
-                    i = close_paren + 1
-                    continue
-        i += 1
-
-    return expansions
+    if not has_expansion_markers(code):
+        return []
+    return list(_find_expansions_cached(code))
 
 
+@lru_cache(maxsize=1024)
 def find_matching_paren(text, start):
     """
     Find the index of the matching closing parenthesis.
@@ -41,16 +63,15 @@ def find_matching_paren(text, start):
         return -1
 
     depth = 1
-    i = start + 1
-
-    while i < len(text) and depth > 0:
-        if text[i] == '(':
+    for match in _PAREN_RE.finditer(text, start + 1):
+        if match.group() == '(':
             depth += 1
-        elif text[i] == ')':
+        else:
             depth -= 1
-        i += 1
+            if depth == 0:
+                return match.start()
 
-    return i - 1 if depth == 0 else -1
+    return -1
 
 
 def replace_expansions_with_placeholders(code):
@@ -58,25 +79,49 @@ def replace_expansions_with_placeholders(code):
     Replace $(), !(), @() with __PH_N__ placeholders so Python can parse it.
     Returns (modified_code, mapping).
     """
-    expansions = find_expansions(code)
+    if not has_expansion_markers(code):
+        return code, {}
+
+    expansions = _find_expansions_cached(code)
+    if not expansions:
+        return code, {}
+
+    # The overwhelmingly common case is a single expansion per line -
+    # splice it directly and skip the chunk list entirely
+    if len(expansions) == 1:
+        op, content, start, end = expansions[0]
+        return (code[:start] + '__PH_0__' + code[end:],
+                {'__PH_0__': (op, content)})
+
+    # Expansion ranges are non-overlapping and ascending, so the output can
+    # be assembled as chunks and joined once instead of rebuilding the whole
+    # string per replacement
     mapping = {}
-
-    # Replace from end to start to preserve positions
-    modified = code
-    for idx, (op, content, start, end) in enumerate(reversed(expansions)):
-        placeholder = f'__PH_{len(expansions) - idx - 1}__'
+    parts = []
+    cursor = 0
+    for idx, (op, content, start, end) in enumerate(expansions):
+        placeholder = f'__PH_{idx}__'
         mapping[placeholder] = (op, content)
-        modified = modified[:start] + placeholder + modified[end:]
+        parts.append(code[cursor:start])
+        parts.append(placeholder)
+        cursor = end
+    parts.append(code[cursor:])
 
-    return modified, mapping
+    return ''.join(parts), mapping
 
 
+@lru_cache(maxsize=512)
 def parse_expansion_content(content, operator):
     """
     Recursively parse expansion content into AST.
 
     For @(expr): Parse as Python expression (must be valid Python)
     For $(cmd) or !(cmd): Keep as string, expand @() recursively at runtime
+
+    Memoized per (content, operator): the compiler front-end is the
+    expensive part and identical expansion text recurs across commands.
+    The returned node is shared - consumers embed it read-only (the
+    transformer never descends into replacement nodes) and unparse it.
     """
     if operator == '@':
         # @(expr) - parse as Python expression
@@ -2,8 +2,14 @@
 Pipeline parsing for shell commands with pipe operators.
 """
 
+from collections import namedtuple
+
 from .tokenizer import tokenize_command, split_by_pipes
-from .redirections import parse_redirection
+from .redirections import REDIRECT_TABLE, parse_redirection
+
+# Pipeline segments as namedtuples: cheaper to allocate than dicts, and
+# attribute access in the executor loops beats per-key hashing
+Segment = namedtuple('Segment', ['parts', 'stdout_redirs', 'stderr_redirs'])
 
 
 def build_pipeline_segments(token_segments):
@@ -11,11 +17,7 @@ def build_pipeline_segments(token_segments):
     pipeline = []
     for parts in token_segments:
         parts, stdout_redirs, stderr_redirs = parse_redirection(parts)
-        pipeline.append({
-            'parts': parts,
-            'stdout_redirs': stdout_redirs,
-            'stderr_redirs': stderr_redirs
-        })
+        pipeline.append(Segment(parts, stdout_redirs, stderr_redirs))
     return pipeline
 
 
@@ -23,16 +25,71 @@ def parse_pipeline_into_segments(command):
     """
     Parse a pipeline command into segments.
 
+    Consumes the token stream in a single fused pass - pipe splitting and
+    redirection extraction happen while walking the tokens once, with no
+    intermediate list-of-lists. (split_by_pipes/build_pipeline_segments
+    remain as standalone helpers.)
+
     Args:
         command: Raw command string (e.g., "ls -l | grep py > out.txt")
 
     Returns:
-        List of dicts with structure:
+        List of Segment namedtuples:
         [
-            {'parts': ['ls', '-l'], 'stdout_redirs': [], 'stderr_redirs': []},
-            {'parts': ['grep', 'py'], 'stdout_redirs': [('out.txt', 'w')], 'stderr_redirs': []}
+            Segment(parts=['ls', '-l'], stdout_redirs=[], stderr_redirs=[]),
+            Segment(parts=['grep', 'py'], stdout_redirs=[('out.txt', 'w')],
+                    stderr_redirs=[])
         ]
     """
+    # No pipe anywhere (quoted or not) means exactly one segment - skip
+    # the per-token pipe checks and segment bookkeeping
+    if '|' not in command:
+        tokens = tokenize_command(command)
+        if not tokens:
+            return []
+        parts, stdout_redirs, stderr_redirs = parse_redirection(tokens)
+        return [Segment(parts, stdout_redirs, stderr_redirs)]
+
     tokens = tokenize_command(command)
-    token_segments = split_by_pipes(tokens)
-    return build_pipeline_segments(token_segments)
+    pipeline = []
+    parts = []
+    stdout_redirs = []
+    stderr_redirs = []
+    seen_token = False
+
+    i = 0
+    n = len(tokens)
+    while i < n:
+        tok = tokens[i]
+
+        if tok == '|':
+            if seen_token:
+                pipeline.append(Segment(parts, stdout_redirs, stderr_redirs))
+                parts, stdout_redirs, stderr_redirs = [], [], []
+                seen_token = False
+            i += 1
+            continue
+
+        seen_token = True
+
+        spec = REDIRECT_TABLE.get(tok)
+        if spec is not None:
+            # A redirect with no filename (end of input or a pipe next)
+            # is dropped, matching parse_redirection
+            if i + 1 >= n or tokens[i + 1] == '|':
+                i += 1
+                continue
+
+            is_stderr, mode = spec
+            target = stderr_redirs if is_stderr else stdout_redirs
+            target.append((tokens[i + 1], mode))
+            i += 2
+            continue
+
+        parts.append(tok)
+        i += 1
+
+    if seen_token:
+        pipeline.append(Segment(parts, stdout_redirs, stderr_redirs))
+
+    return pipeline
@@ -1,23 +1,17 @@
-from .utils import expand_path
-
-
-def is_redirect_operator(token):
-    """Check if token is a redirect operator."""
-    return token in ('>', '1>', '>>', '1>>', '2>', '2>>')
-
-
-def get_redirect_mode(operator):
-    """Get file mode ('a' for append, 'w' for write) from redirect operator."""
-    return 'a' if operator.endswith('>>') else 'w'
+import os
 
+from .utils import expand_path
 
-def add_redirect(operator, filename, stdout_redirs, stderr_redirs):
-    """Add redirect to appropriate list based on operator type."""
-    mode = get_redirect_mode(operator)
-    if operator.startswith('2'):
-        stderr_redirs.append((filename, mode))
-    else:
-        stdout_redirs.append((filename, mode))
+# Redirect operator -> (is_stderr, file mode); one hash probe replaces the
+# tuple-membership scan plus startswith/endswith string checks per token
+REDIRECT_TABLE = {
+    '>': (False, 'w'),
+    '1>': (False, 'w'),
+    '>>': (False, 'a'),
+    '1>>': (False, 'a'),
+    '2>': (True, 'w'),
+    '2>>': (True, 'a'),
+}
 
 
 def parse_redirection(parts):
@@ -40,13 +34,15 @@ def parse_redirection(parts):
     while i < len(parts):
         tok = parts[i]
 
-        if is_redirect_operator(tok):
+        spec = REDIRECT_TABLE.get(tok)
+        if spec is not None:
             # If there's no filename after the operator, drop operator
             if i + 1 >= len(parts):
                 break
 
-            filename = parts[i + 1]
-            add_redirect(tok, filename, stdout_redirs, stderr_redirs)
+            is_stderr, mode = spec
+            target = stderr_redirs if is_stderr else stdout_redirs
+            target.append((parts[i + 1], mode))
             i += 2
             continue
 
@@ -58,11 +54,26 @@ def parse_redirection(parts):
 
 def prime_earlier_redirects(redirs):
     """Create/truncate earlier redirect files for bash-like side effects."""
-    if not redirs:
+    # Zero or one redirect (effectively every command) means there are no
+    # earlier targets - skip the slice and loop setup entirely
+    if len(redirs) < 2:
         return
+
+    # Raw open+close gives the create/truncate side effect without
+    # constructing buffered/text stream objects; O_CLOEXEC keeps the
+    # momentary fd out of any concurrently spawned child. Dedup is keyed
+    # on (path, mode): nothing is written between primes, so repeating an
+    # identical open is a no-op, but a 'w' prime after an 'a' one still
+    # has to truncate (cmd >> f > f > g), exactly as bash opens them.
+    cloexec = getattr(os, 'O_CLOEXEC', 0)
+    seen = set()
     for path, mode in redirs[:-1]:
-        with open(expand_path(path), mode):
-            pass
+        if (path, mode) in seen:
+            continue
+        seen.add((path, mode))
+        flags = os.O_WRONLY | os.O_CREAT | cloexec
+        flags |= os.O_APPEND if mode == 'a' else os.O_TRUNC
+        os.close(os.open(expand_path(path), flags, 0o644))
 
 
 def get_active_redirect_spec(redirs):
@@ -7,18 +7,21 @@ def parse_segment(segment):
     Extract command info and prepare redirects from a pipeline segment.
 
     Args:
-        segment: Dict with 'parts', 'stdout_redirs', 'stderr_redirs'
+        segment: Segment namedtuple (parts, stdout_redirs, stderr_redirs)
 
     Returns:
         (cmd, args, stdout_spec, stderr_spec)
     """
-    parts = segment['parts']
+    parts = segment.parts
     cmd = parts[0] if parts else None
-    args = [expand_path(arg) for arg in parts[1:]] if len(parts) > 1 else []
+    # Only route args through expand_path when they can actually contain a
+    # tilde - one slice-compare per arg beats a call per arg. No length
+    # guard needed: parts[1:] on a short list is already []
+    args = [a if a[:1] != '~' else expand_path(a) for a in parts[1:]]
 
     stdout_spec, stderr_spec = prepare_redirect_specs(
-        segment['stdout_redirs'],
-        segment['stderr_redirs']
+        segment.stdout_redirs,
+        segment.stderr_redirs
     )
 
     return cmd, args, stdout_spec, stderr_spec
@@ -1,13 +1,24 @@
 import shlex
-
-
-def check_and_or(command, i):
-    """Check if current position is a two-character operator (&& or ||)."""
-    if i < len(command) - 1:
-        two_char = command[i:i+2]
-        if two_char in ('&&', '||'):
-            return two_char
-    return None
+import sys
+from functools import lru_cache
+
+# Character classes for the and/or splitter's byte-level state machine.
+# Everything not in the table is class 0 (ordinary), including all UTF-8
+# continuation bytes, so multi-byte characters pass through untouched.
+_CLS_SQUOTE = 1
+_CLS_DQUOTE = 2
+_CLS_ESCAPE = 3
+_CLS_AMP = 4
+_CLS_PIPE = 5
+_CLS_SEMI = 6
+
+_CLASS = bytearray(256)
+_CLASS[ord("'")] = _CLS_SQUOTE
+_CLASS[ord('"')] = _CLS_DQUOTE
+_CLASS[ord('\\')] = _CLS_ESCAPE
+_CLASS[ord('&')] = _CLS_AMP
+_CLASS[ord('|')] = _CLS_PIPE
+_CLASS[ord(';')] = _CLS_SEMI
 
 
 def update_quote_state(char, in_single_quote, in_double_quote):
@@ -19,12 +30,37 @@ def update_quote_state(char, in_single_quote, in_double_quote):
     return in_single_quote, in_double_quote
 
 
+# Characters that give shlex something to do; without them tokenization
+# degenerates to a plain whitespace split
+_SHLEX_CHARS = frozenset('\'"\\')
+
+
+def intern_common_tokens(tokens):
+    """
+    Intern the command name and short flag tokens in place.
+
+    These recur constantly across a session ('ls', '-l', '--color'), so
+    sharing one string object keeps later hash-based dispatch cheap; long
+    tokens (paths, arguments) are left alone to avoid bloating the intern
+    table.
+    """
+    for i, tok in enumerate(tokens):
+        if i == 0 or (tok[:1] == '-' and len(tok) < 32):
+            tokens[i] = sys.intern(tok)
+    return tokens
+
+
 def tokenize_command(command):
     """Tokenize command string, falling back to simple split on error."""
+    # Fast path: no quotes or escapes means shlex would just split on
+    # whitespace - skip constructing its per-call lexer object entirely
+    if _SHLEX_CHARS.isdisjoint(command):
+        return intern_common_tokens(command.split())
+
     try:
-        return shlex.split(command)
+        return intern_common_tokens(shlex.split(command))
     except ValueError:
-        return command.split()
+        return intern_common_tokens(command.split())
 
 
 def split_by_pipes(tokens):
@@ -46,29 +82,51 @@ def split_by_pipes(tokens):
     return segments
 
 
-def add_segment(segments, current_op, command, start, end):
-    """Add a segment to the segments list if non-empty."""
-    segment = command[start:end].strip()
-    if segment:
-        segments.append((current_op, segment))
+# ASCII whitespace byte values, matching what str.strip() removes
+_WS_BYTES = frozenset(b' \t\n\r\x0b\x0c')
+
 
+def add_segment(segments, current_op, buf, start, end):
+    """Add a segment (decoded from the byte buffer) if non-empty."""
+    # Trim whitespace by index math so only the final segment text is
+    # ever sliced - no intermediate substring + stripped copy
+    while start < end and buf[start] in _WS_BYTES:
+        start += 1
+    while end > start and buf[end - 1] in _WS_BYTES:
+        end -= 1
 
+    if start < end:
+        segments.append(
+            (current_op, buf[start:end].decode('utf-8', 'surrogatepass')))
+
+
+@lru_cache(maxsize=256)
 def split_command_by_and_or(command):
     """
     Split command by &&, ||, ; operators (respecting quotes).
 
+    Memoized on the raw command string (splitting is pure), so re-issued
+    lines skip the scan; the result is a tuple and must not be mutated.
+
+    Runs as a state machine over the UTF-8 bytes with a precomputed
+    character-class table, so the per-character work is integer compares
+    instead of string slicing. Operators are ASCII, so byte offsets always
+    land on character boundaries.
+
     Args:
         command: Raw command string
 
     Returns:
-        List of (operator, segment) tuples where operator is the operator
+        Tuple of (operator, segment) pairs where operator is the operator
         that comes BEFORE the segment (None for first segment):
-        [(None, "cmd1"), ("&&", "cmd2"), ("||", "cmd3")]
+        ((None, "cmd1"), ("&&", "cmd2"), ("||", "cmd3"))
 
     Example:
         "ls && pwd || echo fail" →
         [(None, "ls"), ("&&", "pwd"), ("||", "echo fail")]
     """
+    buf = command.encode('utf-8', 'surrogatepass')
+    n = len(buf)
     segments = []
     current_start = 0
     current_op = None
@@ -76,39 +134,53 @@ def split_command_by_and_or(command):
     in_double_quote = False
     i = 0
 
-    while i < len(command):
-        char = command[i]
+    while i < n:
+        cls = _CLASS[buf[i]]
+
+        if cls == 0:
+            i += 1
+            continue
 
         # Handle escape sequences (only in double quotes)
-        if char == '\\' and in_double_quote and i + 1 < len(command):
-            i += 2
+        if cls == _CLS_ESCAPE:
+            i += 2 if in_double_quote and i + 1 < n else 1
+            continue
+
+        if cls == _CLS_SQUOTE:
+            if not in_double_quote:
+                in_single_quote = not in_single_quote
+            i += 1
+            continue
+
+        if cls == _CLS_DQUOTE:
+            if not in_single_quote:
+                in_double_quote = not in_double_quote
+            i += 1
+            continue
+
+        # Operators only count outside quotes
+        if in_single_quote or in_double_quote:
+            i += 1
             continue
 
-        # Update quote state
-        in_single_quote, in_double_quote = update_quote_state(
-            char, in_single_quote, in_double_quote
-        )
-
-        # Look for operators outside quotes
-        if not in_single_quote and not in_double_quote:
-            # Check for && or ||
-            two_char_op = check_and_or(command, i)
-            if two_char_op:
-                add_segment(segments, current_op, command, current_start, i)
-                current_op = two_char_op
-                current_start = i + 2
-                i += 2
-                continue
-
-            # Check for ;
-            if char == ';':
-                add_segment(segments, current_op, command, current_start, i)
-                current_op = ';'
-                current_start = i + 1
+        if cls == _CLS_SEMI:
+            add_segment(segments, current_op, buf, current_start, i)
+            current_op = ';'
+            current_start = i + 1
+            i += 1
+            continue
+
+        # & or |: only doubled forms are operators here
+        if i + 1 < n and buf[i + 1] == buf[i]:
+            add_segment(segments, current_op, buf, current_start, i)
+            current_op = '&&' if cls == _CLS_AMP else '||'
+            current_start = i + 2
+            i += 2
+            continue
 
         i += 1
 
     # Add final segment
-    add_segment(segments, current_op, command, current_start, len(command))
+    add_segment(segments, current_op, buf, current_start, n)
 
-    return segments if segments else [(None, command)]
+    return tuple(segments) if segments else ((None, command),)
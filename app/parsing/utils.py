@@ -4,7 +4,18 @@ Shared utility functions for parsing.
 
 import os
 
+# The home directory can't change mid-session; resolve it once instead of
+# paying expanduser's env/pwd lookup per path
+_HOME = os.path.expanduser('~')
+
 
 def expand_path(path):
     """Expand ~ in path."""
-    return os.path.expanduser(path)
+    # No tilde prefix means nothing to expand - skip expanduser's env and
+    # pwd-database machinery entirely
+    if not path or path[0] != '~':
+        return path
+
+    if len(path) == 1 or path[1] == os.sep:
+        return _HOME + path[1:]
+    return os.path.expanduser(path)  # ~user form
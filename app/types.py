@@ -18,9 +18,13 @@ class Command(str, Enum):
     FALSE = 'false'
 
 
+# Precomputed builtin names for O(1) membership checks on hot dispatch paths
+BUILTIN_NAMES = frozenset(Command._value2member_map_)
+
+
 def is_builtin(command):
     """Check if a command is a shell builtin."""
-    return command in Command._value2member_map_
+    return command in BUILTIN_NAMES
 
 
 class CommandResult:
@@ -1,21 +1,63 @@
-from prompt_toolkit.completion import Completer, Completion, PathCompleter, ExecutableCompleter
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+
+from prompt_toolkit.completion import Completer, Completion, PathCompleter
 from prompt_toolkit.document import Document
 
+from ..commands.resolution import executable_names_for_prefix
+
+# prompt_toolkit can re-query completions for the same buffer state during
+# a single TAB burst or repaint storm; a tiny TTL cache absorbs those
+_CACHE_SIZE = 8
+_CACHE_TTL = 0.5  # seconds
+
 
 class ShellCompleter(Completer):
     """
     Shell completer with command and path completion.
 
-    - First token: builtins and executables from $PATH
+    - First token: builtins and executables from $PATH (served from the
+      shared mtime-validated executable index, not a fresh PATH scan)
     - Other tokens: file/folder paths via PathCompleter
     """
 
     def __init__(self, builtins=None):
         self.builtins = builtins or []
+        # Sorted for bisect-based prefix runs, same as the executable index
+        self._builtins_sorted = tuple(sorted(self.builtins))
         self.path_completer = PathCompleter(expanduser=True)
-        self.executable_completer = ExecutableCompleter()
+        # (cwd, text) -> (timestamp, completions); guarded because
+        # completions run on a worker thread (complete_in_thread=True)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def get_completions(self, document, complete_event):
+        key = (os.getcwd(), document.text_before_cursor)
+        now = time.monotonic()
+
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit is not None and now - hit[0] < _CACHE_TTL:
+                self._cache.move_to_end(key)
+                completions = hit[1]
+            else:
+                completions = None
+
+        if completions is None:
+            completions = list(
+                self.generate_completions(document, complete_event))
+            with self._cache_lock:
+                self._cache[key] = (now, completions)
+                self._cache.move_to_end(key)
+                while len(self._cache) > _CACHE_SIZE:
+                    self._cache.popitem(last=False)
+
+        yield from completions
+
+    def generate_completions(self, document, complete_event):
         text = document.text_before_cursor
         seen = set()
 
@@ -30,35 +72,44 @@ class ShellCompleter(Completer):
         word = text[word_start:]
         sub_doc = Document(word)
 
-        # Path completions (always available)
+        # Path completions (always available). Reconstructing the full name
+        # for dedup only matters on the first token, where an executable
+        # file in the cwd can collide with the command completions below;
+        # argument completions have no second source to collide with
         for completion in self.path_completer.get_completions(sub_doc, complete_event):
-            full_path = word[:len(
-                word) + completion.start_position] + completion.text
-
-            if full_path not in seen:
+            if is_first_token:
+                full_path = word[:len(
+                    word) + completion.start_position] + completion.text
+                if full_path in seen:
+                    continue
                 seen.add(full_path)
-                yield Completion(
-                    completion.text,
-                    start_position=completion.start_position,
-                    display=completion.display,
-                )
+
+            yield Completion(
+                completion.text,
+                start_position=completion.start_position,
+                display=completion.display,
+            )
 
         # Command completions (first token only)
         if is_first_token and word:
-            for cmd in self.builtins:
-                if cmd.startswith(word) and cmd not in seen:
+            builtins_sorted = self._builtins_sorted
+            start = bisect_left(builtins_sorted, word)
+            for idx in range(start, len(builtins_sorted)):
+                cmd = builtins_sorted[idx]
+                if not cmd.startswith(word):
+                    break
+                if cmd not in seen:
                     seen.add(cmd)
                     yield Completion(cmd, start_position=-len(word))
 
-            for completion in self.executable_completer.get_completions(sub_doc, complete_event):
-                # Calculate full command name (word prefix + completion suffix)
-                full_cmd = word[:len(
-                    word) + completion.start_position] + completion.text
-
-                if full_cmd not in seen:
-                    seen.add(full_cmd)
-                    yield Completion(
-                        completion.text,
-                        start_position=completion.start_position,
-                        display=completion.display,
-                    )
+            # Executables come from the cached PATH listing's first-char
+            # bucket; bisect then jumps straight to the prefix run
+            names = executable_names_for_prefix(word)
+            start = bisect_left(names, word)
+            for idx in range(start, len(names)):
+                name = names[idx]
+                if not name.startswith(word):
+                    break
+                if name not in seen:
+                    seen.add(name)
+                    yield Completion(name, start_position=-len(word))
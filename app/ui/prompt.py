@@ -2,6 +2,7 @@ import code
 import os
 import sys
 import socket
+from functools import lru_cache
 from pathlib import Path
 from prompt_toolkit import PromptSession
 from prompt_toolkit.history import FileHistory
@@ -18,28 +19,69 @@ from .completer import ShellCompleter
 from ..parsing.expansions import replace_expansions_with_placeholders
 
 
-# Cache for static prompt parts
-_prompt_cache = {}
+# Cached prompt state as module globals - get_prompt runs in the render
+# cycle, and LOAD_GLOBAL beats a dict probe per field
+_USER = None
+_HOST = None
+_HOME = None
+_HOME_LEN = 0
+_LAST_CWD = None
+_PROMPT_DIR = None
+_TEMPLATE = None
+_TEMPLATE_VENV = None
+
+
+# Last venv detection, keyed by the env-var fingerprint it depends on -
+# these only change on explicit (de)activation, so hits are ~100%
+_venv_key = None
+_venv_name = None
 
 
 def get_venv_name():
     """Detect active virtual environment name."""
-    venv_path = os.environ.get('VIRTUAL_ENV')
+    global _venv_key, _venv_name
+
+    key = (os.environ.get('VIRTUAL_ENV'),
+           os.environ.get('CONDA_DEFAULT_ENV'))
+    if key == _venv_key:
+        return _venv_name
+
+    venv_path, conda_env = key
     if venv_path:
-        return Path(venv_path).name
+        name = Path(venv_path).name
+    elif conda_env and conda_env != 'base':
+        name = conda_env
+    elif hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
+        name = Path(sys.prefix).name
+    else:
+        name = None
 
-    conda_env = os.environ.get('CONDA_DEFAULT_ENV')
-    if conda_env and conda_env != 'base':
-        return conda_env
+    _venv_key = key
+    _venv_name = name
+    return name
 
-    if hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
-        return Path(sys.prefix).name
 
-    return None
+def has_excess_open_brackets(text):
+    """Count bracket balance with C-level scans: more openers than closers."""
+    return (text.count('(') > text.count(')')
+            or text.count('[') > text.count(']')
+            or text.count('{') > text.count('}'))
 
 
+@lru_cache(maxsize=512)
 def is_python_code_complete(text):
-    """Check if Python code is complete and ready to execute."""
+    """Check if Python code is complete and ready to execute.
+
+    Memoized: the compile probe runs on every Enter press and the same
+    buffer text recurs constantly while editing multiline input.
+    """
+    # Quick reject while typing inside an open bracket: when no string or
+    # comment can be hiding a bracket, an excess of openers can't compile
+    # to a complete block - six str.count scans beat a full compile
+    if ("'" not in text and '"' not in text and '#' not in text
+            and has_excess_open_brackets(text)):
+        return False
+
     modified_text, _ = replace_expansions_with_placeholders(text)
 
     try:
@@ -50,52 +92,74 @@ def is_python_code_complete(text):
 
 def get_auto_indent(text):
     """Calculate auto-indent for Python code based on the last line."""
-    for line in reversed(text.split('\n')):
+    # Walk backwards with rfind - only the last non-blank line matters,
+    # so splitting the whole buffer into a line list is wasted work
+    end = len(text)
+    while end > 0:
+        newline = text.rfind('\n', 0, end)
+        line = text[newline + 1:end]
         if line.strip():
             indent = len(line) - len(line.lstrip())
             if line.rstrip().endswith(':'):
                 return ' ' * (indent + 4)
             return ' ' * indent
+        if newline < 0:
+            break
+        end = newline
     return ''
 
 
 def get_prompt():
     """Build the shell prompt text."""
-    if 'user' not in _prompt_cache:
-        _prompt_cache['user'] = os.environ.get(
-            "USER") or os.environ.get("USERNAME") or ""
-        _prompt_cache['host'] = socket.gethostname()
-        _prompt_cache['home'] = str(Path.home())
+    global _USER, _HOST, _HOME, _HOME_LEN
+    global _LAST_CWD, _PROMPT_DIR, _TEMPLATE, _TEMPLATE_VENV
 
-    user = _prompt_cache['user']
-    host = _prompt_cache['host']
-    home = _prompt_cache['home']
+    if _USER is None:
+        _USER = os.environ.get("USER") or os.environ.get("USERNAME") or ""
+        _HOST = socket.gethostname()
+        _HOME = str(Path.home())
+        _HOME_LEN = len(_HOME)
 
+    # The cwd rarely changes between prompts - only re-prettify when it does
     cwd = os.getcwd()
-    prompt_dir = cwd.replace(home, "~") if cwd.startswith(home) else cwd
-
-    # Build prompt parts
-    prompt_parts = []
-
-    # Add venv name if active
+    if cwd != _LAST_CWD:
+        _LAST_CWD = cwd
+        # One prefix scan plus a boundary check - the boundary test also
+        # keeps sibling dirs like /home/userx from abbreviating to ~x
+        if cwd.startswith(_HOME) and (
+                len(cwd) == _HOME_LEN or cwd[_HOME_LEN] == os.sep):
+            _PROMPT_DIR = "~" + cwd[_HOME_LEN:]
+        else:
+            _PROMPT_DIR = cwd
+
+    # Reuse the prompt template across iterations - only the directory slot
+    # changes between prompts (and the venv prefix when one is (de)activated)
     venv = get_venv_name()
-    if venv:
-        prompt_parts.extend([
-            ('class:pygments.comment', '('),
-            ('class:pygments.name.decorator', venv),
-            ('class:pygments.comment', ') '),
+    if _TEMPLATE is None or _TEMPLATE_VENV != venv:
+        template = []
+
+        # Add venv name if active
+        if venv:
+            template.extend([
+                ('class:pygments.comment', '('),
+                ('class:pygments.name.decorator', venv),
+                ('class:pygments.comment', ') '),
+            ])
+
+        # Add user@host and directory (a mutable slot, rebound per prompt)
+        template.extend([
+            ('class:pygments.name.function', _USER),
+            ('class:pygments.operator', '@'),
+            ('class:pygments.name.class', f"{_HOST} "),
+            ['class:pygments.literal.string', ''],
+            ('class:pygments.operator', ' > '),
         ])
 
-    # Add user@host and directory
-    prompt_parts.extend([
-        ('class:pygments.name.function', user),
-        ('class:pygments.operator', '@'),
-        ('class:pygments.name.class', f"{host} "),
-        ('class:pygments.literal.string', prompt_dir),
-        ('class:pygments.operator', ' > '),
-    ])
+        _TEMPLATE = template
+        _TEMPLATE_VENV = venv
 
-    return FormattedText(prompt_parts)
+    _TEMPLATE[-2][1] = _PROMPT_DIR
+    return FormattedText(_TEMPLATE)
 
 
 def create_key_bindings():
@@ -140,14 +204,26 @@ def get_continuation_prompt(width, line_number, is_soft_wrap):
     ])
 
 
+@lru_cache(maxsize=1)
+def get_prompt_style():
+    """Build the pygments style once - get_style_by_name imports a module."""
+    return style_from_pygments_cls(get_style_by_name('dracula'))
+
+
+@lru_cache(maxsize=1)
+def get_shell_lexer():
+    """Share one PygmentsLexer wrapper across sessions."""
+    return PygmentsLexer(ShellLexer)
+
+
 def create_prompt_session(builtin_commands=None, histfile=None):
     """Create and configure a PromptSession for the shell."""
-    style = style_from_pygments_cls(get_style_by_name('dracula'))
+    style = get_prompt_style()
     completer = ShellCompleter(builtin_commands)
     history = FileHistory(histfile) if histfile else None
 
     return PromptSession(
-        lexer=PygmentsLexer(ShellLexer),
+        lexer=get_shell_lexer(),
         style=style,
         multiline=True,
         key_bindings=create_key_bindings(),
@@ -1,7 +1,11 @@
 import os
 import re
-import shutil
+import time
+from functools import lru_cache
 from keyword import iskeyword
+
+from ..commands.resolution import file_exists_in_path
+from ..parsing.utils import expand_path
 from pygments.lexer import include, inherit
 from pygments.lexers.python import Python3Lexer
 from pygments.token import (
@@ -15,20 +19,45 @@ from pygments.token import (
 
 COMMAND_TOKEN_RE = r'[^=\s\[\]{}()$"\'`<&|;!]+(?=\s|$|\)|\]|\}|!)'
 
+# Compiled once - the leading-command match runs on every redraw of every
+# line, and the implicit re-cache lookup per call isn't free
+_LEAD_CMD_RE = re.compile(rf'(\s*)({COMMAND_TOKEN_RE})')
+
 
 def is_valid_command(cmd):
-    """Check if command exists in PATH and is not a Python keyword."""
-    return not iskeyword(cmd) and shutil.which(cmd) is not None
+    """Check if command exists in PATH and is not a Python keyword.
+
+    Resolution goes through the shared mtime-validated PATH index, so the
+    per-keystroke highlighting cost is a hash probe, not a PATH walk.
+    """
+    return not iskeyword(cmd) and file_exists_in_path(cmd) is not None
 
 
-def is_valid_path(path):
-    """Check if path exists."""
+# Same redraw-burst TTL the completion cache uses (chunk8-9): long enough
+# to absorb a keystroke burst, short enough that a freshly created file
+# picks up its highlight within half a second
+_PATH_VALID_TTL = 0.5
+
+
+@lru_cache(maxsize=1024)
+def _path_exists_cached(path, _bucket):
+    """Check path existence, keyed by a TTL time bucket for expiry."""
     try:
-        return os.path.exists(os.path.expanduser(path))
+        return os.path.exists(expand_path(path))
     except (OSError, ValueError):
         return False
 
 
+def is_valid_path(path):
+    """Check if path exists.
+
+    Cached per redraw burst: the lexer re-validates the same tokens many
+    times per keystroke, but answers expire after the TTL so filesystem
+    changes show up in the highlighting almost immediately.
+    """
+    return _path_exists_cached(path, int(time.monotonic() / _PATH_VALID_TTL))
+
+
 def subproc_cmd_callback(_, match):
     """Yield Name.Builtin if command exists, otherwise Text."""
     cmd = match.group()
@@ -94,7 +123,7 @@ class ShellLexer(Python3Lexer):
         state = ('root',)
 
         # Check if line starts with a command
-        m = re.match(rf'(\s*)({COMMAND_TOKEN_RE})', text)
+        m = _LEAD_CMD_RE.match(text)
         if m is not None:
             yield m.start(1), Whitespace, m.group(1)
             start = m.end(1)
@@ -0,0 +1,103 @@
+"""Tests for PATH command resolution caching."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.commands import resolution
+
+
+class TestPathResolution(unittest.TestCase):
+    """Test the cached $PATH resolution and its invalidation rules."""
+
+    def setUp(self):
+        """Point $PATH at a private directory the test can mutate."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.bindir = self._tmp.name
+        self._old_path = os.environ.get('PATH', '')
+        os.environ['PATH'] = self.bindir
+        self._mtime = 1_000_000_000_000_000_000
+
+    def tearDown(self):
+        """Restore $PATH and drop the temp directory."""
+        os.environ['PATH'] = self._old_path
+        self._tmp.cleanup()
+
+    def install(self, name):
+        """Create an executable script in the test bin directory."""
+        path = os.path.join(self.bindir, name)
+        with open(path, 'w') as f:
+            f.write('#!/bin/sh\n')
+        os.chmod(path, 0o755)
+        self.bump_mtime()
+        return path
+
+    def remove(self, name):
+        """Delete an executable from the test bin directory."""
+        os.unlink(os.path.join(self.bindir, name))
+        self.bump_mtime()
+
+    def bump_mtime(self):
+        """Give the bin directory a distinct mtime_ns (avoids fs granularity)."""
+        self._mtime += 1_000_000_000
+        os.utime(self.bindir, ns=(self._mtime, self._mtime))
+
+    def test_lookup_finds_installed_command(self):
+        """Test that a command on $PATH resolves to its full path."""
+        path = self.install('pynix-test-cmd')
+        self.assertEqual(resolution.file_exists_in_path('pynix-test-cmd'), path)
+        # Second lookup is served from the memo table
+        self.assertEqual(resolution.file_exists_in_path('pynix-test-cmd'), path)
+
+    def test_miss_is_not_cached(self):
+        """Test that a failed lookup succeeds after the command appears."""
+        self.assertIsNone(resolution.file_exists_in_path('pynix-test-cmd'))
+        path = self.install('pynix-test-cmd')
+        self.assertEqual(resolution.file_exists_in_path('pynix-test-cmd'), path)
+
+    def test_path_change_invalidates(self):
+        """Test that changing $PATH drops previously resolved commands."""
+        self.install('pynix-test-cmd')
+        self.assertIsNotNone(resolution.file_exists_in_path('pynix-test-cmd'))
+
+        with tempfile.TemporaryDirectory() as other:
+            os.environ['PATH'] = other
+            self.assertIsNone(resolution.file_exists_in_path('pynix-test-cmd'))
+
+    def test_mtime_bump_rebuilds_directory_index(self):
+        """Test that a changed directory is rescanned on lookup."""
+        self.install('pynix-test-cmd')
+        self.assertIsNotNone(resolution.file_exists_in_path('pynix-test-cmd'))
+
+        self.remove('pynix-test-cmd')
+        other = self.install('pynix-other-cmd')
+        # A fresh name forces the directory walk, which sees the new mtime
+        self.assertEqual(resolution.file_exists_in_path('pynix-other-cmd'), other)
+        self.assertIsNone(resolution.file_exists_in_path('pynix-test-cmd'))
+
+    def test_warm_pass_flushes_stale_resolutions(self):
+        """Test that warm/completion rescans drop memoized dead paths."""
+        self.install('pynix-test-cmd')
+        self.assertIsNotNone(resolution.file_exists_in_path('pynix-test-cmd'))
+
+        self.remove('pynix-test-cmd')
+        # The completion listing triggers a warm pass, rebuilding the
+        # changed index - resolution must agree with completion afterwards
+        self.assertNotIn('pynix-test-cmd', resolution.executable_names())
+        self.assertIsNone(resolution.file_exists_in_path('pynix-test-cmd'))
+
+    def test_executable_names_tracks_installs(self):
+        """Test that the completion listing picks up new executables."""
+        self.assertNotIn('pynix-test-cmd', resolution.executable_names())
+        self.install('pynix-test-cmd')
+        names = resolution.executable_names()
+        self.assertIn('pynix-test-cmd', names)
+        self.assertEqual(
+            resolution.executable_names_for_prefix('pynix')[0][:5], 'pynix')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -46,6 +46,17 @@ class TestShellExecution(unittest.TestCase):
         run_command('result = !(ls); print("returncode:", result.returncode)')
         self.assertIn('returncode: 0', sys.stdout.getvalue())
 
+    def test_blank_substitution(self):
+        """Test that a whitespace-only substitution yields an empty string."""
+        run_command('result = $( )')
+        self.assertEqual(python_namespace['result'], '')
+
+    def test_blank_full_substitution(self):
+        """Test that !() with only whitespace succeeds with no output."""
+        run_command('result = !( )')
+        self.assertEqual(python_namespace['result'].returncode, 0)
+        self.assertEqual(python_namespace['result'].stdout, '')
+
     def test_shell_pwd(self):
         """Test shell pwd command."""
         # Ensure we're in a valid directory (test isolation issue)